@@ -5,12 +5,119 @@ This script creates a standalone HTML file with an interactive household viewer
 that can be hosted on GitHub Pages.
 """
 
+import io
+import json
+from contextlib import redirect_stdout
+
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.colors import get_colorscale
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 
+def _shorten_treatment(treatment):
+    """
+    Shorten an antimalarial treatment description for display.
+
+    Parameters
+    ----------
+    treatment : str
+        Antimalarial medication as recorded in the PRISM data
+
+    Returns
+    -------
+    str
+        Short treatment label, or `treatment` unchanged if not recognized
+    """
+    if 'Artmether-lumefantrine' in treatment:
+        return 'AL treatment'
+    elif 'Quinine' in treatment and 'complicated' in treatment:
+        return 'Quinine (complicated)'
+    elif 'Quinine' in treatment and '14 days' in treatment:
+        return 'Quinine (repeat)'
+    elif 'Quinine' in treatment and 'pregnancy' in treatment:
+        return 'Quinine (pregnancy)'
+    elif 'Artesunate' in treatment:
+        return 'Artesunate (complicated)'
+    return treatment
+
+
+def _parasite_hover_text(parasite_pos, treatment_map):
+    """
+    Build hover text for parasite-positive observations in one vectorized pass.
+
+    Parameters
+    ----------
+    parasite_pos : pd.DataFrame
+        Parasite-positive observations for a household
+    treatment_map : dict
+        Mapping from raw antimalarial text to its short display label
+
+    Returns
+    -------
+    list of str
+        Hover text for each row of `parasite_pos`
+    """
+    index = parasite_pos.index
+    density = parasite_pos['parasitedensity'].to_numpy()
+    density_txt = pd.Series(np.select(
+        [density >= 1e6, density >= 1e3],
+        [np.char.mod('%.1fM', density / 1e6), np.char.mod('%.1fK', density / 1e3)],
+        default=np.char.mod('%d', density)
+    ), index=index)
+
+    treatment = parasite_pos['antimalarial']
+    treated = treatment.notna() & ~treatment.isin(['', 'No malaria medications given'])
+
+    # Add fever, gametocyte, and treatment status to hover text
+    extra_info = (
+        pd.Series('<br>Fever: Yes', index=index).where(parasite_pos['fever'] == 'Yes', '')
+        + pd.Series('<br>Gametocytes: Yes', index=index).where(parasite_pos['gametocytes'] == 'Yes', '')
+        + ('<br>Treatment: ' + treatment.map(treatment_map).astype(object)).where(treated, '')
+    )
+
+    hover_text = ('<b>Parasite Positive</b><br>Density: ' + density_txt
+                  + ' /µL<br>Date: ' + parasite_pos['date'].dt.strftime('%Y-%m-%d')
+                  + '<br>ID: ' + parasite_pos['id'].astype(int).astype(str)
+                  + extra_info)
+    return hover_text.tolist()
+
+
+def _y_axis_labels(age, gender_initial):
+    """
+    Build y-axis ticks for a household, one per member row.
+
+    Every row gets a tick so gridlines are drawn for all members, but only a
+    subsample of at most ~50 rows is labeled with age and gender.
+
+    Parameters
+    ----------
+    age : np.ndarray
+        Age at enrollment of each household member, in row order
+    gender_initial : np.ndarray
+        First letter of each household member's gender ('?' if missing), in row order
+
+    Returns
+    -------
+    y_positions : list of int
+        Tick position for every member row
+    y_labels : list of str
+        Tick label for every member row ('' for unlabeled rows)
+    """
+    n_rows = len(age)
+    subsample = max(1, n_rows // 50)
+    labeled_age = age[::subsample]
+    age_txt = np.where(np.isnan(labeled_age), '?', np.nan_to_num(labeled_age).astype(int).astype(str))
+
+    # Add gridline-only ticks for ALL row positions (not just labeled ones)
+    y_positions = list(range(n_rows))
+    y_labels = [''] * n_rows
+    y_labels[::subsample] = [f"{a} {g}" for a, g in zip(age_txt, gender_initial[::subsample])]
+    return y_positions, y_labels
+
+
 def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
     """
     Create an interactive household viewer with dropdown navigation.
@@ -21,10 +128,29 @@ def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
         Site name ('nagongera', 'walukuba', or 'kihihi')
     output_file : str or Path
         Output HTML file path
+
+    Returns
+    -------
+    dict
+        Plotly figure dictionary with `data` and `layout`
     """
 
     print(f"Loading PRISM data for {site.upper()} site...")
-    df = pd.read_csv(f'data/prism_cleaned_{site}.csv', parse_dates=['date'])
+    df = pd.read_csv(
+        f'data/prism_cleaned_{site}.csv',
+        parse_dates=['date'],
+        engine='pyarrow',
+        dtype={
+            'id': 'int32',
+            'parasitedensity': 'float64',
+            # Low-cardinality text columns as categoricals so masks compare integer codes
+            'LAMP': 'category',
+            'fever': 'category',
+            'gametocytes': 'category',
+            'gender': 'category',
+            'antimalarial': 'category'
+        }
+    )
     print(f"Loaded {len(df)} observations for {df['id'].nunique()} participants")
 
     # Get global date range for locked x-axis with 4-month padding
@@ -49,247 +175,162 @@ def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
     household_ids = multi_person.index.tolist()
     print(f"\nFound {len(household_ids)} multi-person households with infections")
 
-    # Create figure with all households as separate traces
-    fig = go.Figure()
-
     # Color definitions
     lamp_color = 'rgba(255, 237, 160, 0.6)'
+    parasite_colorscale = get_colorscale('YlOrRd')
 
-    # Process each household and create trace groups
-    all_traces = []
-    household_trace_ranges = []  # Store (start, end, y_labels, y_positions, n_members, n_infections) for each household
-
-    for hh_idx, household_id in enumerate(household_ids):
-        household_data = df[df['Household_Id'] == household_id].copy()
-
-        # Sort by age and create index
-        household_data = household_data.sort_values(by='age_at_enrollment')
-        unique_ids = household_data.drop_duplicates(subset=['id'], keep='first').copy()
-        unique_ids['idx'] = range(len(unique_ids))
-        household_data = household_data.merge(unique_ids[['id', 'idx']], on='id', how='left')
-
-        # Store trace start index for this household
-        trace_start = len(all_traces)
-
+    # One fixed trace per marker category; the dropdown swaps each household's
+    # data into these traces instead of toggling per-household traces
+    all_traces = [
         # 1. All visits (background)
-        all_traces.append(go.Scatter(
-            x=household_data['date'],
-            y=household_data['idx'],
-            mode='markers',
-            marker=dict(size=3, color='darkgray'),
-            name='All visits',
-            hoverinfo='skip',
-            legendgroup='visits',
-            showlegend=(hh_idx == 0)
-        ))
-
+        dict(name='All visits', hoverinfo='skip', legendgroup='visits'),
         # 2. Fever visits
-        fever = household_data[household_data['fever'] == 'Yes']
-        all_traces.append(go.Scatter(
-            x=fever['date'],
-            y=fever['idx'],
-            mode='markers',
-            marker=dict(size=5, color='firebrick'),
-            name='Fever',
-            hoverinfo='skip',
-            legendgroup='fever',
-            showlegend=(hh_idx == 0)
-        ))
-
+        dict(name='Fever', hoverinfo='skip', legendgroup='fever'),
         # 3. LAMP negative
-        lamp = household_data[household_data['LAMP'].isin(['Positive', 'Negative'])].copy()
-        lamp_neg = lamp[lamp['LAMP'] == 'Negative']
-        all_traces.append(go.Scatter(
-            x=lamp_neg['date'],
-            y=lamp_neg['idx'],
-            mode='markers',
-            marker=dict(size=8, color='rgba(0,0,0,0)', line=dict(color='darkgray', width=1)),
+        dict(
             name='LAMP negative',
+            marker=dict(line=dict(color='darkgray', width=1)),
             hovertemplate='<b>LAMP Negative</b><br>Date: %{x|%Y-%m-%d}<br>ID: %{customdata[0]}<extra></extra>',
-            customdata=lamp_neg[['id']].values if len(lamp_neg) > 0 else [],
-            legendgroup='lamp_neg',
-            showlegend=(hh_idx == 0)
-        ))
-
+            legendgroup='lamp_neg'
+        ),
         # 4. LAMP positive
-        lamp_pos = lamp[lamp['LAMP'] == 'Positive']
-        all_traces.append(go.Scatter(
-            x=lamp_pos['date'],
-            y=lamp_pos['idx'],
-            mode='markers',
-            marker=dict(size=10, color=lamp_color, line=dict(color='darkgray', width=1)),
+        dict(
             name='LAMP positive (submicroscopic)',
+            marker=dict(line=dict(color='darkgray', width=1)),
             hovertemplate='<b>LAMP Positive</b><br>Date: %{x|%Y-%m-%d}<br>ID: %{customdata[0]}<extra></extra>',
-            customdata=lamp_pos[['id']].values if len(lamp_pos) > 0 else [],
-            legendgroup='lamp_pos',
-            showlegend=(hh_idx == 0)
-        ))
-
+            legendgroup='lamp_pos'
+        ),
         # 5. Microscopy negative
-        micro_only = household_data[(~household_data['LAMP'].isin(['Positive', 'Negative', 'No result'])) &
-                                    (household_data['parasitedensity'].notna())].copy()
-        micro_neg = micro_only[micro_only['parasitedensity'] == 0]
-        all_traces.append(go.Scatter(
-            x=micro_neg['date'],
-            y=micro_neg['idx'],
-            mode='markers',
-            marker=dict(size=10, color='rgba(0,0,0,0)', line=dict(color='darkgray', width=1)),
+        dict(
             name='Microscopy negative',
+            marker=dict(line=dict(color='darkgray', width=1)),
             hovertemplate='<b>Microscopy Negative</b><br>Date: %{x|%Y-%m-%d}<br>ID: %{customdata[0]}<extra></extra>',
-            customdata=micro_neg[['id']].values if len(micro_neg) > 0 else [],
-            legendgroup='micro_neg',
-            showlegend=(hh_idx == 0)
-        ))
-
+            legendgroup='micro_neg'
+        ),
         # 6. Parasite positive
-        parasite_pos = micro_only[micro_only['parasitedensity'] > 0].copy()
-        if len(parasite_pos) > 0:
-            marker_size = 50 * np.log10(parasite_pos['parasitedensity'])
-            marker_size[marker_size < 10] = 10
-            marker_size = marker_size / 4.5
-
-            hover_text = []
-            for _, row in parasite_pos.iterrows():
-                density = row['parasitedensity']
-                if density >= 1e6:
-                    txt = f'{density/1e6:.1f}M'
-                elif density >= 1e3:
-                    txt = f'{density/1e3:.1f}K'
-                else:
-                    txt = f'{int(density)}'
-
-                # Add fever, gametocyte, and treatment status to hover text
-                extra_info = []
-                if row['fever'] == 'Yes':
-                    extra_info.append('Fever: Yes')
-                if row['gametocytes'] == 'Yes':
-                    extra_info.append('Gametocytes: Yes')
-                if pd.notna(row['antimalarial']) and row['antimalarial'] != 'No malaria medications given' and row['antimalarial'] != '':
-                    # Shorten the treatment text for display
-                    treatment = row['antimalarial']
-                    if 'Artmether-lumefantrine' in treatment:
-                        treatment = 'AL treatment'
-                    elif 'Quinine' in treatment and 'complicated' in treatment:
-                        treatment = 'Quinine (complicated)'
-                    elif 'Quinine' in treatment and '14 days' in treatment:
-                        treatment = 'Quinine (repeat)'
-                    elif 'Quinine' in treatment and 'pregnancy' in treatment:
-                        treatment = 'Quinine (pregnancy)'
-                    elif 'Artesunate' in treatment:
-                        treatment = 'Artesunate (complicated)'
-                    extra_info.append(f'Treatment: {treatment}')
-
-                hover_line = f"<b>Parasite Positive</b><br>Density: {txt} /µL<br>Date: {row['date'].strftime('%Y-%m-%d')}<br>ID: {int(row['id'])}"
-                if extra_info:
-                    hover_line += '<br>' + '<br>'.join(extra_info)
-                hover_text.append(hover_line)
-
-            all_traces.append(go.Scatter(
-                x=parasite_pos['date'],
-                y=parasite_pos['idx'],
-                mode='markers',
-                marker=dict(
-                    size=marker_size,
-                    color=np.log10(parasite_pos['parasitedensity']),
-                    colorscale='YlOrRd',
-                    cmin=1,
-                    cmax=5.5,
-                    line=dict(color='darkgray', width=0.5),
-                    colorbar=dict(
-                        title='Parasite<br>Density<br>(log10)',
-                        tickvals=[1, 2, 3, 4, 5],
-                        ticktext=['10', '100', '1K', '10K', '100K'],
-                        len=0.4,
-                        y=0.4,
-                        yanchor='top'
-                    ) if hh_idx == 0 else None
-                ),
-                name='Parasite positive',
-                hovertemplate='%{hovertext}<extra></extra>',
-                hovertext=hover_text,
-                legendgroup='parasite',
-                showlegend=(hh_idx == 0)
-            ))
-
-            # 7. Gametocytes
-            parasite_pos_gam = parasite_pos[parasite_pos['gametocytes'] == 'Yes'].copy()
-            if len(parasite_pos_gam) > 0:
-                marker_size_gam = 50 * np.log10(parasite_pos_gam['parasitedensity'])
-                marker_size_gam[marker_size_gam < 10] = 10
-                marker_size_gam = marker_size_gam / 4.5
-
-                all_traces.append(go.Scatter(
-                    x=parasite_pos_gam['date'],
-                    y=parasite_pos_gam['idx'],
-                    mode='markers',
-                    marker=dict(size=marker_size_gam + 2, color='rgba(0,0,0,0)', line=dict(color='olive', width=2)),
-                    name='Gametocytes detected',
-                    hoverinfo='skip',
-                    legendgroup='gametocytes',
-                    showlegend=(hh_idx == 0)
-                ))
-            else:
-                all_traces.append(go.Scatter(x=[], y=[], showlegend=False))
-        else:
-            # Add empty traces to maintain consistent indexing
-            all_traces.append(go.Scatter(x=[], y=[], showlegend=False))
-            all_traces.append(go.Scatter(x=[], y=[], showlegend=False))
-
-        trace_end = len(all_traces)
+        dict(
+            name='Parasite positive',
+            marker=dict(
+                colorscale=parasite_colorscale,
+                cmin=1,
+                cmax=5.5,
+                line=dict(color='darkgray', width=0.5),
+                colorbar=dict(
+                    title=dict(text='Parasite<br>Density<br>(log10)'),
+                    tickvals=[1, 2, 3, 4, 5],
+                    ticktext=['10', '100', '1K', '10K', '100K'],
+                    len=0.4,
+                    y=0.4,
+                    yanchor='top'
+                )
+            ),
+            hovertemplate='%{hovertext}<extra></extra>',
+            legendgroup='parasite'
+        ),
+        # 7. Gametocytes
+        dict(
+            name='Gametocytes detected',
+            marker=dict(line=dict(color='olive', width=2)),
+            hoverinfo='skip',
+            legendgroup='gametocytes'
+        )
+    ]
+    for trace in all_traces:
+        trace.update(type='scattergl', mode='markers')
+
+    # Column arrays (structure of arrays) with every visit classified once for
+    # the whole site, so per-household work is plain integer indexing
+    dates = df['date'].to_numpy()
+    ids = df['id'].to_numpy()
+    ages = df['age_at_enrollment'].to_numpy()
+    density = df['parasitedensity'].to_numpy()
+
+    # Gender initial per category, with '?' at the end for missing (code -1)
+    gender_initials = np.append(df['gender'].cat.categories.str[0].to_numpy(dtype=object), '?')
+    gender_initial = gender_initials[df['gender'].cat.codes.to_numpy()]
+
+    is_fever = (df['fever'] == 'Yes').to_numpy()
+    is_lamp_neg = (df['LAMP'] == 'Negative').to_numpy()
+    is_lamp_pos = (df['LAMP'] == 'Positive').to_numpy()
+    is_micro_only = ~(is_lamp_neg | is_lamp_pos | (df['LAMP'] == 'No result').to_numpy()) & ~np.isnan(density)
+    is_micro_neg = is_micro_only & (density == 0)
+    is_parasite_pos = is_micro_only & (density > 0)
+    is_gametocyte_pos = is_parasite_pos & (df['gametocytes'] == 'Yes').to_numpy()
+
+    # Shorten each treatment category once rather than per observation
+    treatment_map = {tx: _shorten_treatment(tx) for tx in df['antimalarial'].cat.categories}
+
+    # Row indices of each household from a single pass over the data
+    hh_rows = df.groupby('Household_Id', sort=False).indices
+
+    # Member (y-axis) index of each row, filled in per household
+    row_idx = np.zeros(len(df), dtype=int)
+
+    # Process each household into per-trace data for the dropdown
+    household_traces = []  # Store trace data, y_labels, y_positions, n_members, n_infections for each household
+
+    for household_id, n_members, n_infections in zip(multi_person.index.to_numpy(),
+                                                      multi_person['n_members'].to_numpy(),
+                                                      multi_person['total_infections'].to_numpy()):
+        # Sort by age and index members in order of first appearance
+        rows = hh_rows[household_id]
+        rows = rows[np.argsort(ages[rows])]
+        member_codes, member_ids = pd.factorize(ids[rows])
+        row_idx[rows] = member_codes
+
+        # One row per member for labels; any of its rows will do since age at
+        # enrollment and gender are per-participant
+        member_rows = np.empty(len(member_ids), dtype=rows.dtype)
+        member_rows[member_codes] = rows
+
+        fever_rows = rows[is_fever[rows]]
+        lamp_neg_rows = rows[is_lamp_neg[rows]]
+        lamp_pos_rows = rows[is_lamp_pos[rows]]
+        micro_neg_rows = rows[is_micro_neg[rows]]
+        parasite_rows = rows[is_parasite_pos[rows]]
+        has_gam = is_gametocyte_pos[parasite_rows]
+        gam_rows = parasite_rows[has_gam]
+
+        # Log density drives both marker size and color
+        log_density = np.log10(density[parasite_rows])
+        marker_size = np.maximum(50 * log_density, 10) / 4.5
+
+        # Restyle update with one entry per trace, in the order of all_traces
+        subsets = [rows, fever_rows, lamp_neg_rows, lamp_pos_rows, micro_neg_rows, parasite_rows, gam_rows]
+        trace_data = {
+            'x': [dates[subset] for subset in subsets],
+            'y': [row_idx[subset] for subset in subsets],
+            'customdata': [None, None, ids[lamp_neg_rows, np.newaxis], ids[lamp_pos_rows, np.newaxis],
+                           ids[micro_neg_rows, np.newaxis], None, None],
+            'hovertext': [None, None, None, None, None, _parasite_hover_text(df.iloc[parasite_rows], treatment_map), None],
+            'marker.size': [3, 5, 8, 10, 10, marker_size, marker_size[has_gam] + 2],
+            'marker.color': ['darkgray', 'firebrick', 'rgba(0,0,0,0)', lamp_color, 'rgba(0,0,0,0)',
+                             log_density, 'rgba(0,0,0,0)']
+        }
 
         # Create y-axis labels for this household
-        y_labels = []
-        y_positions = []
-        subsample = max(1, len(unique_ids) // 50)
-        for _, row in unique_ids.iloc[::subsample].iterrows():
-            age = int(row['age_at_enrollment']) if pd.notna(row['age_at_enrollment']) else '?'
-            gender = row['gender'][0] if pd.notna(row['gender']) else '?'
-            y_labels.append(f"{age} {gender}")
-            y_positions.append(row['idx'])
-
-        # Add gridline-only ticks for ALL row positions (not just labeled ones)
-        all_y_positions = list(range(len(unique_ids)))
-        all_y_labels = ['' if i not in y_positions else y_labels[y_positions.index(i)]
-                        for i in all_y_positions]
-
-        y_positions_with_bottom = all_y_positions
-        y_labels_with_bottom = all_y_labels
-
-        # Get household stats
-        n_members = multi_person.loc[household_id, 'n_members']
-        n_infections = multi_person.loc[household_id, 'total_infections']
+        y_positions, y_labels = _y_axis_labels(ages[member_rows], gender_initial[member_rows])
 
         # Store info for button creation later
-        household_trace_ranges.append({
+        household_traces.append({
             'household_id': household_id,
-            'trace_start': trace_start,
-            'trace_end': trace_end,
-            'y_labels': y_labels_with_bottom,
-            'y_positions': y_positions_with_bottom,
+            'trace_data': trace_data,
+            'y_labels': y_labels,
+            'y_positions': y_positions,
             'n_members': n_members,
             'n_infections': n_infections,
-            'n_unique_ids': len(unique_ids)
+            'n_unique_ids': len(member_rows)
         })
 
-    # Add all traces to figure
-    for trace in all_traces:
-        fig.add_trace(trace)
-
-    # Now create buttons with correct total trace count
-    total_traces = len(all_traces)
+    # Now create buttons that swap each household's data into the traces
     all_buttons = []
 
-    for hh_info in household_trace_ranges:
-        # Build visibility array: show only traces for this household
-        visible = [False] * total_traces
-        for i in range(hh_info['trace_start'], hh_info['trace_end']):
-            visible[i] = True
-
+    for hh_info in household_traces:
         button = dict(
             label=f"HH {hh_info['household_id']} ({int(hh_info['n_members'])}m, {int(hh_info['n_infections'])}i)",
             method="update",
             args=[
-                {"visible": visible},
+                hh_info['trace_data'],
                 {
                     "title": f"Household {hh_info['household_id']} - {int(hh_info['n_members'])} members, {int(hh_info['n_infections'])} microscopy-positive observations",
                     "yaxis.tickvals": hh_info['y_positions'],
@@ -301,38 +342,28 @@ def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
         )
         all_buttons.append(button)
 
-    # Set initial visibility using the first button's visibility array
-    if len(all_buttons) > 0:
-        initial_visibility = all_buttons[0]['args'][0]['visible']
-        for i, trace in enumerate(fig.data):
-            trace.visible = initial_visibility[i]
-
-    # Get first household info for initial display
-    household_id = household_ids[0]
-    household_data = df[df['Household_Id'] == household_id].copy()
-    household_data = household_data.sort_values(by='age_at_enrollment')
-    unique_ids = household_data.drop_duplicates(subset=['id'], keep='first').copy()
-    unique_ids['idx'] = range(len(unique_ids))
-
-    y_labels = []
-    y_positions = []
-    subsample = max(1, len(unique_ids) // 50)
-    for _, row in unique_ids.iloc[::subsample].iterrows():
-        age = int(row['age_at_enrollment']) if pd.notna(row['age_at_enrollment']) else '?'
-        gender = row['gender'][0] if pd.notna(row['gender']) else '?'
-        y_labels.append(f"{age} {gender}")
-        y_positions.append(row['idx'])
-
-    # Add ticks for ALL row positions to ensure gridlines at every row
-    all_y_positions = list(range(len(unique_ids)))
-    all_y_labels = ['' if i not in y_positions else y_labels[y_positions.index(i)]
-                    for i in all_y_positions]
-
-    y_positions = all_y_positions
-    y_labels = all_y_labels
-
-    # Update layout with dropdown
-    fig.update_layout(
+    # Populate the traces with the first household's data
+    initial_data = household_traces[0]['trace_data']
+    for i, trace in enumerate(all_traces):
+        trace.update(
+            x=initial_data['x'][i],
+            y=initial_data['y'][i],
+            customdata=initial_data['customdata'][i],
+            hovertext=initial_data['hovertext'][i]
+        )
+        trace.setdefault('marker', {}).update(
+            size=initial_data['marker.size'][i],
+            color=initial_data['marker.color'][i]
+        )
+
+    # Axis labels for the initial display come from the first household
+    hh0 = household_traces[0]
+    y_positions = hh0['y_positions']
+    y_labels = hh0['y_labels']
+    n_unique_ids_0 = hh0['n_unique_ids']
+
+    # Layout with dropdown
+    layout = dict(
         updatemenus=[
             dict(
                 buttons=all_buttons,
@@ -356,19 +387,19 @@ def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
             xanchor='center'
         ),
         xaxis=dict(
-            title='Date',
+            title=dict(text='Date'),
             gridcolor='lightgray',
             gridwidth=0.5,
             range=[global_date_min, global_date_max]
         ),
         yaxis=dict(
-            title='Age (years) & Gender',
+            title=dict(text='Age (years) & Gender'),
             tickmode='array',
             tickvals=y_positions,
             ticktext=y_labels,
             gridcolor='lightgray',
             gridwidth=0.5,
-            range=[-0.5, len(unique_ids) - 0.5],
+            range=[-0.5, n_unique_ids_0 - 0.5],
             showgrid=True,
             griddash='solid',
             zeroline=True,
@@ -388,24 +419,28 @@ def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
             bgcolor='rgba(255,255,255,0.8)',
             bordercolor='black',
             borderwidth=1
-        )
+        ),
+        template=pio.templates[pio.templates.default].to_plotly_json()
     )
 
+    # Traces and layout are plain dicts, so skip graph-object validation
+    fig = dict(data=all_traces, layout=layout)
+
     # Save to HTML
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Create a mapping from household_id to index for synchronization
     household_id_to_index = {str(hh_info['household_id']): idx
-                             for idx, hh_info in enumerate(household_trace_ranges)}
+                             for idx, hh_info in enumerate(household_traces)}
 
     # Add custom JavaScript for keyboard navigation and buttons
     keyboard_nav_script = """
     <script>
     // Track current household index
     var currentHouseholdIndex = 0;
-    var totalHouseholds = """ + str(len(all_buttons)) + """;
-    var householdIdToIndex = """ + str(household_id_to_index) + """;
+    var totalHouseholds = """ + json.dumps(len(all_buttons)) + """;
+    var householdIdToIndex = """ + json.dumps(household_id_to_index) + """;
     var updatingFromCode = false;  // Flag to prevent circular updates
 
     // Keyboard navigation
@@ -525,24 +560,21 @@ def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
     </script>
     """
 
-    fig.write_html(
-        output_path,
+    html_content = pio.to_html(
+        fig,
         include_plotlyjs='cdn',
         config={
             'displayModeBar': True,
             'displaylogo': False,
             'modeBarButtonsToRemove': ['lasso2d', 'select2d']
-        }
+        },
+        validate=False
     )
 
-    # Append custom JavaScript by modifying the HTML file
-    with open(output_path, 'r') as f:
-        html_content = f.read()
-
     # Insert the keyboard navigation script before the closing body tag
     html_content = html_content.replace('</body>', keyboard_nav_script + '\n</body>')
 
-    with open(output_path, 'w') as f:
+    with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html_content)
 
     print(f"\nGenerated interactive viewer: {output_path}")
@@ -551,15 +583,36 @@ def create_interactive_viewer(site='nagongera', output_file='docs/index.html'):
     return fig
 
 
+def _generate_site_viewer(site):
+    """
+    Generate the viewer for one site at docs/<site>.html.
+
+    Parameters
+    ----------
+    site : str
+        Site name ('nagongera', 'walukuba', or 'kihihi')
+
+    Returns
+    -------
+    str
+        Progress output captured while generating the viewer
+    """
+    with redirect_stdout(io.StringIO()) as output:
+        create_interactive_viewer(site=site, output_file=f'docs/{site}.html')
+    return output.getvalue()
+
+
 if __name__ == '__main__':
-    # Generate viewer for each site
+    # Generate viewer for each site; sites are independent, so build them in
+    # parallel and print each site's progress in order
     sites = ['nagongera', 'walukuba', 'kihihi']
 
-    for site in sites:
-        print("\n" + "=" * 80)
-        print(f"GENERATING VIEWER FOR {site.upper()}")
-        print("=" * 80)
-        create_interactive_viewer(site=site, output_file=f'docs/{site}.html')
+    with ProcessPoolExecutor(max_workers=len(sites)) as executor:
+        for site, output in zip(sites, executor.map(_generate_site_viewer, sites)):
+            print("\n" + "=" * 80)
+            print(f"GENERATING VIEWER FOR {site.upper()}")
+            print("=" * 80)
+            print(output, end='')
 
     print("\n" + "=" * 80)
     print("GENERATION COMPLETE")
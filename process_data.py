@@ -7,9 +7,132 @@ for each site that can be used for visualization.
 
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 
+def _process_site(site_name, site_description, df, n_households, n_participants, output_dir):
+    """
+    Clean one site's observations and save them as a CSV file.
+
+    Parameters
+    ----------
+    site_name : str
+        Sub-county name of the site
+    site_description : str
+        Transmission setting of the site, used in the report header
+    df : pd.DataFrame
+        Site observations merged with participant and sample columns
+    n_households : int
+        Number of households at the site
+    n_participants : int
+        Number of participants at the site
+    output_dir : Path
+        Directory where the cleaned CSV file will be saved
+
+    Returns
+    -------
+    str
+        Summary report for the site
+    """
+    report = [
+        "\n" + "=" * 80,
+        f"PROCESSING {site_name.upper()} - {site_description}",
+        "=" * 80,
+        f"\n{site_name} statistics:",
+        f"  Households: {n_households}",
+        f"  Participants: {n_participants}",
+        f"  Observations: {df.shape[0]}",
+        f"  Samples: {(df['sample_merge'] == 'both').sum()}"
+    ]
+
+    # Rename columns to simpler names
+    column_mapping = {
+        'Observation date [EUPATH_0004991]': 'date',
+        'Participant_Id': 'id',
+        'Sex [PATO_0000047]': 'gender',
+        'Age at enrollment (years) [EUPATH_0000120]': 'age_at_enrollment',
+        'Enrollment date [EUPATH_0000151]': 'enrollment_date',
+        'Age (years) [OBI_0001169]': 'age',
+        'Temperature (C) [EUPATH_0000110]': 'temperature',
+        'Febrile [EUPATH_0000097]': 'fever',
+        'Plasmodium asexual stages, by microscopy result (/uL) [EUPATH_0000092]': 'parasitedensity',
+        'Plasmodium gametocytes, by microscopy [EUPATH_0000207]': 'gametocytes',
+        'Plasmodium, by LAMP [EUPATH_0000487]': 'LAMP',
+        'Observation type [BFO_0000015]': 'visittype',
+        'Hemoglobin (g/dL) [EUPATH_0000047]': 'hemoglobin',
+        'Malaria diagnosis [EUPATH_0000090]': 'malaria_diagnosis',
+        'Antimalarial medication [EUPATH_0000058]': 'antimalarial',
+    }
+
+    df = df.rename(columns=column_mapping)
+
+    # Select relevant columns
+    relevant_cols = ['date', 'id', 'Household_Id', 'age', 'age_at_enrollment', 'gender',
+                     'temperature', 'fever', 'parasitedensity', 'gametocytes', 'LAMP',
+                     'visittype', 'hemoglobin', 'malaria_diagnosis', 'antimalarial']
+
+    relevant_cols = [col for col in relevant_cols if col in df.columns]
+    df_clean = df[relevant_cols].copy()
+
+    # Convert date column
+    df_clean['date'] = pd.to_datetime(df_clean['date'])
+
+    # Summary statistics
+    report.append(f"\n  Date range: {df_clean['date'].min().date()} to {df_clean['date'].max().date()}")
+
+    id_codes, _ = pd.factorize(df_clean['id'].to_numpy())
+    obs_per_participant = np.bincount(id_codes)
+    report.append(f"  Observations per participant: mean={obs_per_participant.mean():.1f}, median={np.median(obs_per_participant):.1f}")
+
+    density = df_clean['parasitedensity'].to_numpy()
+    parasite_pos = density[density > 0]
+    if len(parasite_pos) > 0:
+        prevalence = 100 * len(parasite_pos) / len(df_clean)
+        report.append(f"  Microscopy prevalence: {prevalence:.2f}%")
+        report.append(f"  Positive density: mean={parasite_pos.mean():.0f}, median={np.median(parasite_pos):.0f} parasites/µL")
+    else:
+        report.append(f"  Microscopy prevalence: 0.00%")
+
+    # Save site-specific file
+    output_file = output_dir / f'prism_cleaned_{site_name.lower()}.csv'
+    df_clean.to_csv(output_file, index=False)
+    report.append(f"\n  Saved: {output_file}")
+
+    return "\n".join(report)
+
+
+def _load_cached(raw_path, cache_path, **read_kwargs):
+    """
+    Load a raw PRISM TSV file, using a parquet copy when it is up to date.
+
+    The first load parses the TSV and writes the parquet copy. Later loads
+    read the parquet copy directly, unless the raw file has been modified
+    since the copy was written.
+
+    Parameters
+    ----------
+    raw_path : Path
+        Raw tab-separated PRISM data file
+    cache_path : Path
+        Location of the parquet copy of the raw file
+    **read_kwargs
+        Extra keyword arguments passed to pd.read_csv
+
+    Returns
+    -------
+    pd.DataFrame
+        Contents of the raw file
+    """
+    if cache_path.exists() and cache_path.stat().st_mtime >= raw_path.stat().st_mtime:
+        return pd.read_parquet(cache_path, engine='pyarrow')
+
+    df = pd.read_csv(raw_path, sep='\t', engine='pyarrow', **read_kwargs)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(cache_path, engine='pyarrow', index=False)
+    return df
+
+
 def process_prism_data(data_dir='data', output_dir='data'):
     """
     Load and process PRISM data files, creating site-specific cleaned datasets.
@@ -24,41 +147,41 @@ def process_prism_data(data_dir='data', output_dir='data'):
     data_dir = Path(data_dir)
     output_dir = Path(output_dir)
 
+    # Parsed copies of the raw files are kept as parquet for faster reloads
+    cache_dir = data_dir / '_cache'
+
     print("=" * 80)
     print("LOADING PRISM DATA FILES")
     print("=" * 80)
 
     # Load the main data files
     print("\n1. Loading Households...")
-    households = pd.read_csv(
+    households = _load_cached(
         data_dir / 'PRISM_cohort_Households.txt',
-        sep='\t',
-        low_memory=False
+        cache_dir / 'households.parquet'
     )
     print(f"   Shape: {households.shape}")
     print(f"   Sub-counties: {households['Sub-county in Uganda [EUPATH_0000054]'].value_counts().to_dict()}")
 
     print("\n2. Loading Participants...")
-    participants = pd.read_csv(
+    participants = _load_cached(
         data_dir / 'PRISM_cohort_Participants.txt',
-        sep='\t',
-        low_memory=False
+        cache_dir / 'participants.parquet',
+        dtype={'Participant_Id': 'int32'}
     )
     print(f"   Shape: {participants.shape}")
 
     print("\n3. Loading Participant Repeated Measures...")
-    repeated_measures = pd.read_csv(
+    repeated_measures = _load_cached(
         data_dir / 'PRISM_cohort_Participant_repeated_measures.txt',
-        sep='\t',
-        low_memory=False
+        cache_dir / 'participant_repeated_measures.parquet'
     )
     print(f"   Shape: {repeated_measures.shape}")
 
     print("\n4. Loading Samples...")
-    samples = pd.read_csv(
+    samples = _load_cached(
         data_dir / 'PRISM_cohort_Samples.txt',
-        sep='\t',
-        low_memory=False
+        cache_dir / 'samples.parquet'
     )
     print(f"   Shape: {samples.shape}")
 
@@ -77,111 +200,57 @@ def process_prism_data(data_dir='data', output_dir='data'):
     print(f"Total participants across all sites: {participants['Participant_Id'].nunique()}")
     print(f"Total observations across all sites: {repeated_measures.shape[0]}")
 
+    site_col = 'Sub-county in Uganda [EUPATH_0000054]'
+
     # Store all original data with merged household info before site filtering
     participants_all = participants.merge(
-        households[['Household_Id', 'Sub-county in Uganda [EUPATH_0000054]']],
+        households[['Household_Id', site_col]],
         on='Household_Id',
         how='left'
     )
 
-    # Process each site separately
-    for site_name, site_description in SITES.items():
-        print("\n" + "=" * 80)
-        print(f"PROCESSING {site_name.upper()} - {site_description}")
-        print("=" * 80)
-
-        # Filter to current site
-        site_households = households[
-            households['Sub-county in Uganda [EUPATH_0000054]'] == site_name
-        ]['Household_Id'].unique()
-
-        site_participants = participants_all[
-            participants_all['Household_Id'].isin(site_households)
-        ].copy()
-
-        site_repeated_measures = repeated_measures[
-            repeated_measures['Participant_Id'].isin(site_participants['Participant_Id'])
-        ].copy()
-
-        site_samples = samples[
-            samples['Participant_repeated_measure_Id'].isin(site_repeated_measures['Participant_repeated_measure_Id'])
-        ].copy()
-
-        print(f"\n{site_name} statistics:")
-        print(f"  Households: {len(site_households)}")
-        print(f"  Participants: {site_participants['Participant_Id'].nunique()}")
-        print(f"  Observations: {site_repeated_measures.shape[0]}")
-        print(f"  Samples: {site_samples.shape[0]}")
-
-        # Merge datasets for this site
-        df = site_repeated_measures.merge(
-            site_participants[['Participant_Id', 'Sex [PATO_0000047]',
-                              'Age at enrollment (years) [EUPATH_0000120]',
-                              'Enrollment date [EUPATH_0000151]']],
-            on='Participant_Id',
-            how='left'
-        )
-
-        df = df.merge(
-            site_samples[['Participant_repeated_measure_Id',
-                         'Plasmodium asexual stages, by microscopy result (/uL) [EUPATH_0000092]',
-                         'Plasmodium gametocytes, by microscopy [EUPATH_0000207]',
-                         'Plasmodium, by LAMP [EUPATH_0000487]',
-                         'Hemoglobin (g/dL) [EUPATH_0000047]']],
-            on='Participant_repeated_measure_Id',
-            how='left'
-        )
-
-        # Rename columns to simpler names
-        column_mapping = {
-            'Observation date [EUPATH_0004991]': 'date',
-            'Participant_Id': 'id',
-            'Sex [PATO_0000047]': 'gender',
-            'Age at enrollment (years) [EUPATH_0000120]': 'age_at_enrollment',
-            'Enrollment date [EUPATH_0000151]': 'enrollment_date',
-            'Age (years) [OBI_0001169]': 'age',
-            'Temperature (C) [EUPATH_0000110]': 'temperature',
-            'Febrile [EUPATH_0000097]': 'fever',
-            'Plasmodium asexual stages, by microscopy result (/uL) [EUPATH_0000092]': 'parasitedensity',
-            'Plasmodium gametocytes, by microscopy [EUPATH_0000207]': 'gametocytes',
-            'Plasmodium, by LAMP [EUPATH_0000487]': 'LAMP',
-            'Observation type [BFO_0000015]': 'visittype',
-            'Hemoglobin (g/dL) [EUPATH_0000047]': 'hemoglobin',
-            'Malaria diagnosis [EUPATH_0000090]': 'malaria_diagnosis',
-            'Antimalarial medication [EUPATH_0000058]': 'antimalarial',
-        }
-
-        df = df.rename(columns=column_mapping)
-
-        # Select relevant columns
-        relevant_cols = ['date', 'id', 'Household_Id', 'age', 'age_at_enrollment', 'gender',
-                         'temperature', 'fever', 'parasitedensity', 'gametocytes', 'LAMP',
-                         'visittype', 'hemoglobin', 'malaria_diagnosis', 'antimalarial']
-
-        relevant_cols = [col for col in relevant_cols if col in df.columns]
-        df_clean = df[relevant_cols].copy()
-
-        # Convert date column
-        df_clean['date'] = pd.to_datetime(df_clean['date'])
-
-        # Print summary statistics
-        print(f"\n  Date range: {df_clean['date'].min().date()} to {df_clean['date'].max().date()}")
-
-        obs_per_participant = df_clean.groupby('id').size()
-        print(f"  Observations per participant: mean={obs_per_participant.mean():.1f}, median={obs_per_participant.median():.1f}")
-
-        parasite_pos = df_clean[df_clean['parasitedensity'] > 0]['parasitedensity']
-        if len(parasite_pos) > 0:
-            prevalence = 100 * len(parasite_pos) / len(df_clean)
-            print(f"  Microscopy prevalence: {prevalence:.2f}%")
-            print(f"  Positive density: mean={parasite_pos.mean():.0f}, median={parasite_pos.median():.0f} parasites/µL")
-        else:
-            print(f"  Microscopy prevalence: 0.00%")
-
-        # Save site-specific file
-        output_file = output_dir / f'prism_cleaned_{site_name.lower()}.csv'
-        df_clean.to_csv(output_file, index=False)
-        print(f"\n  Saved: {output_file}")
+    # Join every observation with its participant's site and details and its
+    # sample results once; each site is then a single group of this table
+    measures_all = repeated_measures.merge(
+        participants_all[['Participant_Id', site_col, 'Sex [PATO_0000047]',
+                          'Age at enrollment (years) [EUPATH_0000120]',
+                          'Enrollment date [EUPATH_0000151]']],
+        on='Participant_Id',
+        how='left'
+    )
+
+    measures_all = measures_all.merge(
+        samples[['Participant_repeated_measure_Id',
+                 'Plasmodium asexual stages, by microscopy result (/uL) [EUPATH_0000092]',
+                 'Plasmodium gametocytes, by microscopy [EUPATH_0000207]',
+                 'Plasmodium, by LAMP [EUPATH_0000487]',
+                 'Hemoglobin (g/dL) [EUPATH_0000047]']],
+        on='Participant_repeated_measure_Id',
+        how='left',
+        indicator='sample_merge'
+    )
+
+    measures_by_site = measures_all.groupby(site_col)
+    households_per_site = households.groupby(site_col)['Household_Id'].nunique()
+    participants_per_site = participants_all.groupby(site_col)['Participant_Id'].nunique()
+
+    # Sites are independent once the joined table is built, so process them in
+    # parallel and print each site's report in order
+    with ProcessPoolExecutor(max_workers=len(SITES)) as executor:
+        futures = [
+            executor.submit(
+                _process_site,
+                site_name,
+                site_description,
+                measures_by_site.get_group(site_name),
+                households_per_site.get(site_name, 0),
+                participants_per_site.get(site_name, 0),
+                output_dir
+            )
+            for site_name, site_description in SITES.items()
+        ]
+        for future in futures:
+            print(future.result())
 
     print("\n" + "=" * 80)
     print("PROCESSING COMPLETE")